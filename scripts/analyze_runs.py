@@ -0,0 +1,153 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # 只輸出圖檔，不需要初始化 GUI backend
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+try:
+    import pandas as pd
+except ImportError:  # pandas 為選用套件，沒有時退回 numpy.loadtxt
+    pd = None
+
+# 超過此大小的 log 才改用 pandas 的 C parser (小檔案時建立 DataFrame 的額外成本反而較高)
+PANDAS_MIN_BYTES = 1 << 20
+
+
+def has_data_rows(csv_path: Path) -> bool:
+    """
+    判斷 CSV 在標頭之後是否還有非空白的資料列 (通常只需讀到第二行)。
+    """
+    with open(csv_path, 'rb') as f:
+        f.readline()  # 略過標頭
+        return any(line.strip() for line in f)
+
+
+def load_convergence(csv_path: Path, save_npy: bool = False):
+    """
+    讀取 logs/convergence_*.csv (Timestamp(s),BestCost)。
+
+    若同名的 .npy 檔存在、不比 CSV 舊 (僅依 mtime 判斷) 且為 N x 2 陣列，
+    直接以 np.load 讀取二進位陣列，完全略過文字解析；否則解析 CSV。
+
+    Args:
+        csv_path (Path): 收斂曲線 CSV 檔案路徑。
+        save_npy (bool): 解析 CSV 後是否寫出 .npy 快取，供之後的分析直接使用。
+
+    Returns:
+        (np.ndarray, np.ndarray): 時間 (秒) 與對應的最佳成本。
+    """
+    npy_path = csv_path.with_suffix('.npy')
+    csv_stat = csv_path.stat()
+    if npy_path.exists() and npy_path.stat().st_mtime >= csv_stat.st_mtime:
+        arr = np.load(npy_path)
+        if arr.ndim == 2 and arr.shape[1] == 2:
+            return arr[:, 0], arr[:, 1]
+        print(f"  - 警告：'{npy_path}' 形狀為 {arr.shape}，不是 N x 2，改為解析 CSV。")
+
+    if pd is not None and csv_stat.st_size > PANDAS_MIN_BYTES:
+        arr = pd.read_csv(csv_path, header=0, usecols=[0, 1], dtype=np.float64,
+                          engine='c').to_numpy()
+    elif not has_data_rows(csv_path):
+        # 只有標頭 (或完全空白) 的檔案：np.loadtxt 會發出 "input contained no data" 警告，
+        # 事先判斷並直接回傳空陣列 (此函式會在多執行緒中呼叫，不能用 catch_warnings 改全域設定)
+        arr = np.empty((0, 2), dtype=np.float64)
+    else:
+        arr = np.loadtxt(csv_path, delimiter=',', skiprows=1, usecols=(0, 1),
+                         dtype=np.float64, ndmin=2)
+
+    if save_npy:
+        np.save(npy_path, arr)
+    return arr[:, 0], arr[:, 1]
+
+
+def time_to_target(times, costs, target: float):
+    """
+    回傳最佳成本第一次 <= target 的時間；若從未達到則回傳 None。
+    """
+    mask = np.asarray(costs) <= target
+    if not mask.any():
+        return None
+    return float(np.asarray(times)[mask.argmax()])
+
+
+def step_vertices(times, costs):
+    """
+    將 (時間, 最佳成本) 轉為 where='post' 階梯線的頂點 (N x 2)，供 LineCollection 使用。
+    """
+    return np.column_stack([np.repeat(times, 2)[1:], np.repeat(costs, 2)[:-1]])
+
+
+def run_label(csv_path: Path) -> str:
+    """
+    由檔名 convergence_<mode>_[<Strategy>_]<Testcase>_<Timestamp>.csv 取出簡短標籤。
+    """
+    parts = csv_path.stem.split('_')
+    if len(parts) > 1 and parts[1] == 'baseline':
+        return 'Baseline'
+    return parts[2] if len(parts) > 2 else csv_path.stem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 baseline 與平行版本的收斂曲線並計算 time-to-target。")
+    parser.add_argument("-b", "--baseline", required=True, type=Path, help="baseline 的 convergence CSV。")
+    parser.add_argument("others", nargs="*", type=Path, help="其他要比較的 convergence CSV。")
+    parser.add_argument("-t", "--target", type=float, default=None,
+                        help="目標成本 (預設為 baseline 的最終最佳成本)。")
+    parser.add_argument("-o", "--output", type=Path, default=Path("convergence.png"), help="輸出圖檔路徑。")
+    parser.add_argument("--logx", action="store_true", help="時間軸使用 log scale。")
+    parser.add_argument("--save-npy", action="store_true",
+                        help="在每個 CSV 旁寫出 .npy 快取，之後的分析可略過 CSV 解析。")
+    args = parser.parse_args()
+
+    load = partial(load_convergence, save_npy=args.save_npy)
+    base_t, base_c = load(args.baseline)
+    if base_c.size == 0:
+        print(f"錯誤：baseline 檔案 '{args.baseline}' 沒有任何資料。")
+        return
+
+    target = args.target if args.target is not None else float(base_c[-1])
+    print(f"目標成本 (target): {target:.2f}")
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.step(base_t, base_c, where='post', linewidth=1.5, color='black', label='Baseline')
+    print(f"  {'Baseline':<24} time-to-target = {time_to_target(base_t, base_c, target)}")
+
+    # 所有其他曲線收集成一個 LineCollection，一次加入圖中，而非每條各建一個 Line2D
+    colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    segments, handles = [], []
+    # 多個 log 以執行緒並行讀取，讓檔案 I/O 彼此重疊
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        runs = list(ex.map(load, args.others))
+    for csv_path, (t, c) in zip(args.others, runs):
+        if c.size == 0:
+            print(f"  - 警告：'{csv_path}' 沒有任何資料，已跳過。")
+            continue
+        label = run_label(csv_path)
+        segments.append(step_vertices(t, c))
+        handles.append(Line2D([], [], linewidth=1, color=colors[len(handles) % len(colors)], label=label))
+        print(f"  {label:<24} time-to-target = {time_to_target(t, c, target)}")
+
+    if segments:
+        ax.add_collection(LineCollection(segments, linewidths=1, colors=[h.get_color() for h in handles]))
+        ax.autoscale_view()
+
+    ax.axhline(target, linestyle=':', linewidth=0.8, color='gray')
+    if args.logx:
+        ax.set_xscale('log')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Best Cost')
+    ax.set_title(args.baseline.stem)
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax.legend(handles=[*ax.get_legend_handles_labels()[0], *handles], fontsize='small', loc='best')
+    fig.savefig(args.output, dpi=150, bbox_inches='tight')
+    print(f"收斂曲線已儲存至: '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
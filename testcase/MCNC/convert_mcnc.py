@@ -1,7 +1,83 @@
 import argparse
+import itertools
+import mmap
+import os
 import re
+import stat
 from pathlib import Path
 
+# 一次性找到所有需要的資訊 (模組層級只編譯一次，批次轉換多個檔案時不必重複編譯)
+# 第1組: 模組名稱 (例如 "bk1")
+# 第2組: 寬度 (DIMENSIONS 後的第一個數字)
+# 第3組: 高度 (DIMENSIONS 後的第四個數字)
+# 中間逐一略過以 ';' 結尾的敘述 (例如 "TYPE PAD;")，遇到 ENDMODULE 就停止，
+# 因此缺少 DIMENSIONS 的模組不會跨越到下一個 MODULE 去配對；
+# DIMENSIONS 前同一段中的註解 (例如 "/* Dummy */") 也允許。
+# 每段敘述都以 ';' 結束且 [^;] 不含 ';'，切分方式唯一，不會產生大量回溯。
+_MODULE_RE = re.compile(
+    rb'\bMODULE\s+(\w+)\s*;(?:(?!\s*ENDMODULE\b)[^;]*;)*?[^;]*?'
+    rb'\bDIMENSIONS\s+([\d.]+)\s+[\d.]+\s+[\d.]+\s+([\d.]+)',
+    re.ASCII
+)
+
+
+def _convert_content(content, output_file: Path):
+    """
+    掃描已讀入 (或已 mmap) 的 .yal 內容，將區塊寫入 output_file。
+
+    Returns:
+        int | None: 轉換的區塊數；找不到區塊或寫入失敗時回傳 None。
+    """
+    # finditer 逐一產生 match，不需一次建立所有元組的列表
+    # (scanner 會持有 content 的 buffer，須在此函式結束後 mmap 才能關閉)
+    matches = _MODULE_RE.finditer(content)
+    match = next(matches, None)
+
+    if match is None:
+        print("警告：在檔案中找不到任何有效的 'MODULE ... DIMENSIONS ...' 區塊。請檢查檔案格式。")
+        return None
+
+    converted = 0
+
+    # 以 generator 逐行產生輸出，避免先組出整份輸出字串
+    def generate_lines():
+        nonlocal converted
+        for m in itertools.chain((match,), matches):
+            block_name, width_str, height_str = m.groups()
+            try:
+                width = float(width_str)
+                height = float(height_str)
+
+                if width <= 0 or height <= 0:
+                    print(f"  - 警告：跳過寬度或高度為零的區塊 '{block_name.decode('ascii')}'。")
+                    continue
+
+                # 正方形區塊旋轉後尺寸相同，直接比較數值即可，不需先格式化再比對字串
+                # 直接以 bytes 格式化輸出行，名稱不必 decode 再 encode
+                if width == height:
+                    output_line = b"%s (%.2f %.2f 1 1)\n" % (block_name, width, height)
+                else:
+                    output_line = b"%s (%.2f %.2f 1 1) (%.2f %.2f 1 1)\n" % (
+                        block_name, width, height, height, width)
+
+                converted += 1
+                yield output_line
+
+            except ValueError:
+                print(f"  - 警告：無法解析區塊 '{block_name.decode('ascii')}' 的尺寸，已跳過。")
+                continue
+
+    try:
+        # 1 MiB 寫入緩衝區，減少 write 系統呼叫次數
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.writelines(generate_lines())
+    except IOError as e:
+        print(f"錯誤：無法寫入輸出檔案 '{output_file}': {e}")
+        return None
+
+    return converted
+
+
 def convert_bbl_to_custom(input_file: Path, output_file: Path):
     """
     讀取使用 MODULE ... DIMENSIONS ... 格式的 .bbl/.yal 檔案，
@@ -14,67 +90,26 @@ def convert_bbl_to_custom(input_file: Path, output_file: Path):
     print(f"正在讀取 BBL/YAL (MODULE 格式) 檔案: '{input_file}'")
 
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # 以二進位模式開啟：識別字皆為 ASCII，省去 UTF-8 解碼。
+        # 一般檔案以 mmap 映射：OS 依需求載入分頁，正規表示式直接掃描映射的記憶體；
+        # 空檔案無法 mmap，pipe / FIFO 等非一般檔案的 st_size 也不可靠，這些都改為直接讀取。
+        with open(input_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    converted = _convert_content(content, output_file)
+            else:
+                converted = _convert_content(f.read(), output_file)
     except FileNotFoundError:
         print(f"錯誤：找不到輸入檔案 '{input_file}'。")
         return
 
-    output_lines = []
-    
-    # 簡化並修正正規表示式：一次性找到所有需要的資訊
-    # 第1組: 模組名稱 (例如 "bk1")
-    # 第2組: 寬度 (DIMENSIONS 後的第一個數字)
-    # 第3組: 高度 (DIMENSIONS 後的第四個數字)
-    pattern = re.compile(
-        r'MODULE\s+([\w\d_]+);.*?'
-        r'DIMENSIONS\s+([\d.]+)\s+[\d.]+\s+[\d.]+\s+([\d.]+)',
-        re.DOTALL  # re.DOTALL 讓 '.' 可以匹配換行符
-    )
-
-    # findall 將會回傳一個包含元組(tuple)的列表
-    # 範例: [('bk1', '336', '133'), ('bk10a', '378', '119'), ...]
-    matches = pattern.findall(content)
-
-    if not matches:
-        print("警告：在檔案中找不到任何有效的 'MODULE ... DIMENSIONS ...' 區塊。請檢查檔案格式。")
-        return
-
-    # 現在這個迴圈會正確地將每個元組解包成 3 個變數
-    for block_name, width_str, height_str in matches:
-        try:
-            width = float(width_str)
-            height = float(height_str)
-
-            if width <= 0 or height <= 0:
-                print(f"  - 警告：跳過寬度或高度為零的區塊 '{block_name}'。")
-                continue
-
-            # 產生原始尺寸和旋轉後的尺寸字串
-            dim_original = f"({width:.2f} {height:.2f} 1 1)"
-            dim_rotated = f"({height:.2f} {width:.2f} 1 1)"
-
-            if dim_original == dim_rotated:
-                output_line = f"{block_name} {dim_original}"
-            else:
-                output_line = f"{block_name} {dim_original} {dim_rotated}"
-
-            output_lines.append(output_line)
-
-        except ValueError:
-            print(f"  - 警告：無法解析區塊 '{block_name}' 的尺寸，已跳過。")
-            continue
-            
-    try:
-        with open(output_file, 'w') as f:
-            f.write("\n".join(output_lines))
-    except IOError as e:
-        print(f"錯誤：無法寫入輸出檔案 '{output_file}': {e}")
+    if converted is None:
         return
 
     print("-" * 30)
     print("轉換成功！")
-    print(f"共轉換了 {len(output_lines)} 個 MODULE 區塊。")
+    print(f"共轉換了 {converted} 個 MODULE 區塊。")
     print(f"輸出檔案已儲存至: '{output_file}'")
 
 
@@ -1,12 +1,52 @@
-import random
 import math
+from functools import lru_cache
+
 import numpy as np
 
+
+@lru_cache(maxsize=None)
+def factor_pairs(n: int):
+    """
+    回傳 n 的所有因數分解 (j, n // j)，其中 j <= sqrt(n)。
+    例如 12 -> [(1, 12), (2, 6), (3, 4)]。結果會被快取，重複的 n 不必再算一次。
+    """
+    return [(j, n // j) for j in range(1, math.isqrt(n) + 1) if n % j == 0]
+
+
+def compute_dims(areas, base_aspects, flex_aspects, unit_cell_areas, unit_aspects):
+    """
+    以 numpy 向量一次算出所有區塊的數值尺寸，只接受/回傳 ndarray，
+    字串格式化留給呼叫端處理。
+
+    Args:
+        areas (np.ndarray): 每個區塊的面積。
+        base_aspects (np.ndarray): 基本尺寸 (接近方形) 的長寬比。
+        flex_aspects (np.ndarray): CTRL / IP_CORE 額外尺寸的長寬比。
+        unit_cell_areas (np.ndarray): C_ARRAY 單元面積。
+        unit_aspects (np.ndarray): C_ARRAY 單元長寬比。
+
+    Returns:
+        tuple: (w1, h1, w2, h2, unit_w, unit_h, total_cells)
+    """
+    # 基本尺寸 (接近方形)
+    w1 = np.sqrt(areas * base_aspects)
+    h1 = areas / w1
+    # 彈性尺寸 (CTRL / IP_CORE)
+    w2 = np.sqrt(areas * flex_aspects)
+    h2 = areas / w2
+    # 陣列單元尺寸 (C_ARRAY)
+    unit_w = np.sqrt(unit_cell_areas * unit_aspects)
+    unit_h = unit_cell_areas / unit_w
+    total_cells = np.maximum(1, np.round(areas / unit_cell_areas)).astype(int)
+    return w1, h1, w2, h2, unit_w, unit_h, total_cells
+
+
 def generate_test_case(
     output_filename: str,
     num_blocks: int,
     avg_area: float = 100.0,
-    power_law_alpha: float = 1.8
+    power_law_alpha: float = 1.8,
+    seed: int | None = None
 ):
     """
     產生一個接近現實的類比電路佈局測試案例。
@@ -18,7 +58,10 @@ def generate_test_case(
         power_law_alpha (float): 冪次法則分佈的 alpha 參數。
                                  值越小，大區塊和小區塊的面積差距越大。
                                  典型值在 1.5 到 2.5 之間。
+        seed (int | None): 亂數種子；給定相同種子時會產生完全相同的測試案例。
     """
+    # 所有亂數都來自同一個 Generator (PCG64)，並盡量以向量一次抽取
+    rng = np.random.default_rng(seed)
 
     # 1. 定義不同類型模組的名稱前綴及其出現機率
     module_types = {
@@ -31,104 +74,113 @@ def generate_test_case(
 
     # 2. 使用 Pareto (冪次法則) 分佈產生區塊面積，模擬真實世界分佈
     # 產生比需求更多的樣本，以防有極端值，然後從中取樣
-    samples = (np.random.pareto(power_law_alpha, size=num_blocks * 3) + 1)
+    samples = (rng.pareto(power_law_alpha, size=num_blocks * 3) + 1)
     # 調整分佈，使其平均值約等於 avg_area
     areas = samples / np.mean(samples) * avg_area
-    # 過濾掉太小或太大的區塊，並取樣
-    areas = [area for area in areas if avg_area / 20 < area < avg_area * 20]
+    # 過濾掉太小或太大的區塊，並取樣 (以布林遮罩在 numpy 內完成)
+    areas = areas[(areas > avg_area / 20) & (areas < avg_area * 20)]
     if len(areas) < num_blocks:
         raise ValueError("無法產生足夠的有效面積，請嘗試調整參數。")
-    random.shuffle(areas)
+    rng.shuffle(areas)
     block_areas = areas[:num_blocks]
 
 
     # 3. 產生每個區塊的具體資料
-    blocks = []
+    # 輸出直接累積成 ASCII bytes，省去最後 join 整份字串再 encode 的複製
+    buf = bytearray()
     counters = {prefix: 0 for prefix in module_types}
     
     # 為了確保 MM 模組有成對的機會，預先產生
-    prefixes = random.choices(
-        list(module_types.keys()), 
-        weights=list(module_types.values()), 
-        k=num_blocks
-    )
+    keys = np.array(list(module_types.keys()))
+    probs = np.array(list(module_types.values()))
+    probs /= probs.sum()
+    prefixes = keys[rng.choice(len(keys), size=num_blocks, p=probs)]
     
+    # 確保 MM 模組兩兩成對 (MM_0/MM_1、MM_2/MM_3 ...) 的面積完全一樣
+    # 需在計算尺寸之前完成，因為下方的尺寸改為一次以向量計算
+    mm_idx = np.flatnonzero(prefixes == "MM")
+    pairs = mm_idx[:len(mm_idx) // 2 * 2].reshape(-1, 2)
+    block_areas[pairs[:, 1]] = block_areas[pairs[:, 0]]
+
+    # 預先產生所有區塊的隨機長寬比，並以 numpy 一次算出各種尺寸
+    base_aspects = rng.uniform(0.7, 1.5, num_blocks)
+    flex_aspects = rng.uniform(1.8, 3.0, num_blocks)
+    unit_cell_areas = rng.uniform(2.0, 5.0, num_blocks)
+    unit_aspects = rng.uniform(0.8, 1.2, num_blocks)
+    # C_ARRAY 因數分解的選擇與是否交換行列
+    factor_picks = rng.random(num_blocks)
+    swap_coins = rng.random(num_blocks) > 0.5
+
+    (w1_arr, h1_arr, w2_arr, h2_arr,
+     unit_w_arr, unit_h_arr, total_cells_arr) = compute_dims(
+        block_areas, base_aspects, flex_aspects, unit_cell_areas, unit_aspects
+    )
+    # 先轉成 Python float，迴圈內的 %.2f 格式化就不必經過 np.float64.__format__
+    w1_arr, h1_arr, w2_arr, h2_arr, unit_w_arr, unit_h_arr = (
+        arr.tolist() for arr in (w1_arr, h1_arr, w2_arr, h2_arr, unit_w_arr, unit_h_arr)
+    )
+
     for i in range(num_blocks):
         prefix = prefixes[i]
         name = f"{prefix}_{counters[prefix]}"
         counters[prefix] += 1
         
-        area = block_areas[i]
         dimensions = []
 
         # --- 根據模組類型產生不同的尺寸 ---
 
         # 基本尺寸 (接近方形)
-        base_aspect_ratio = random.uniform(0.7, 1.5)
-        w1 = math.sqrt(area * base_aspect_ratio)
-        h1 = area / w1
-        dimensions.append(f"({w1:.2f} {h1:.2f} 1 1)")
+        w1, h1 = w1_arr[i], h1_arr[i]
+        dimensions.append("(%.2f %.2f 1 1)" % (w1, h1))
         # 旋轉後的尺寸
-        dimensions.append(f"({h1:.2f} {w1:.2f} 1 1)")
+        dimensions.append("(%.2f %.2f 1 1)" % (h1, w1))
 
         if prefix == "C_ARRAY":
             # 產生有意義的陣列結構
-            unit_cell_area = random.uniform(2.0, 5.0)
-            unit_w = math.sqrt(unit_cell_area * random.uniform(0.8, 1.2))
-            unit_h = unit_cell_area / unit_w
-            
-            total_cells = max(1, round(area / unit_cell_area))
+            unit_w, unit_h = unit_w_arr[i], unit_h_arr[i]
             
             # 找到最接近的因數分解 (例如 16 -> 4x4, 12 -> 4x3)
-            factors = []
-            for j in range(1, int(math.sqrt(total_cells)) + 1):
-                if total_cells % j == 0:
-                    factors.append((j, total_cells // j))
+            factors = factor_pairs(int(total_cells_arr[i]))
             
             if factors:
-                rows, cols = random.choice(factors)
-                if random.random() > 0.5: # 隨機交換行列
+                rows, cols = factors[int(factor_picks[i] * len(factors))]
+                if swap_coins[i]: # 隨機交換行列
                     rows, cols = cols, rows
                 
                 array_w = cols * unit_w
                 array_h = rows * unit_h
                 # 用陣列尺寸覆蓋掉原本的尺寸
-                dimensions = [f"({array_w:.2f} {array_h:.2f} {cols} {rows})"]
+                dimensions = ["(%.2f %.2f %d %d)" % (array_w, array_h, cols, rows)]
                 # 也可以加入旋轉後的版本
-                dimensions.append(f"({array_h:.2f} {array_w:.2f} {rows} {cols})")
+                dimensions.append("(%.2f %.2f %d %d)" % (array_h, array_w, rows, cols))
 
         elif prefix == "CTRL" or prefix == "IP_CORE":
             # 這些模組比較有彈性，給予更多長寬比選項
-            flex_aspect_ratio = random.uniform(1.8, 3.0)
-            w2 = math.sqrt(area * flex_aspect_ratio)
-            h2 = area / w2
-            dimensions.append(f"({w2:.2f} {h2:.2f} 1 1)")
-            dimensions.append(f"({h2:.2f} {w2:.2f} 1 1)")
-        
-        # 確保 MM 模組的下一個編號（如果是偶數）尺寸完全一樣
-        if prefix == "MM" and counters[prefix] % 2 == 1 and i + 1 < len(prefixes) and prefixes[i+1] == "MM":
-             # 找到下一個MM模組，讓它的面積和目前這個一樣
-             next_mm_idx = i + 1
-             block_areas[next_mm_idx] = area
+            w2, h2 = w2_arr[i], h2_arr[i]
+            dimensions.append("(%.2f %.2f 1 1)" % (w2, h2))
+            dimensions.append("(%.2f %.2f 1 1)" % (h2, w2))
 
-
-        blocks.append(f"{name} {' '.join(list(set(dimensions)))}")
+        # dict.fromkeys 去除重複 (例如正方形旋轉後相同) 並保留插入順序，輸出才具可重現性
+        buf += f"{name} {' '.join(dict.fromkeys(dimensions))}".encode('ascii')
+        buf.append(0x0A)
 
     # 4. 將結果寫入檔案
-    with open(output_filename, 'w') as f:
-        f.write("\n".join(blocks))
+    with open(output_filename, 'wb') as f:
+        f.write(memoryview(buf))
 
-    print(f"成功產生測試案例 '{output_filename}'，包含 {len(blocks)} 個區塊。")
+    print(f"成功產生測試案例 '{output_filename}'，包含 {num_blocks} 個區塊。")
 
 
 # --- 主程式：如何使用 ---
 if __name__ == "__main__":
+    # 每個案例使用固定的亂數種子，重新執行本腳本會產生完全相同的檔案
+
     # 產生一個小型的測試案例 (30個區塊)
-    generate_test_case("testcase_small.block", num_blocks=6)
+    generate_test_case("testcase_small.block", num_blocks=6, seed=1)
 
     # 產生一個中型的測試案例 (100個區塊)
-    generate_test_case("testcase_medium.block", num_blocks=100)
+    generate_test_case("testcase_medium.block", num_blocks=100, seed=2)
 
     # 產生一個較大的測試案例 (300個區塊)
     # 讓大區塊更突出 (alpha 較小)
-    generate_test_case("testcase_large.block", num_blocks=300, power_law_alpha=1.6)
\ No newline at end of file
+    generate_test_case("testcase_large.block", num_blocks=300, power_law_alpha=1.6, seed=3)
\ No newline at end of file